@@ -1,13 +1,26 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, date, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
+from datetime import date, timedelta
 from data_manager import DataManager
-from visualizations import create_progress_charts, create_custom_task_charts
-from utils import format_time, calculate_progress_percentage
+from visualizations import (
+    create_progress_charts, create_custom_task_charts,
+    build_study_trend_figure, build_study_distribution_figure,
+    build_task_overview_figure
+)
+from utils import format_time
 from task_config_manager import TaskConfigManager
 
+@st.cache_resource
+def get_data_manager() -> DataManager:
+    """Shared DataManager reused across reruns and sessions"""
+    return DataManager()
+
+@st.cache_resource
+def get_task_manager() -> TaskConfigManager:
+    """Shared TaskConfigManager reused across reruns and sessions"""
+    return TaskConfigManager()
+
 def main():
     st.set_page_config(
         page_title="Study Progress Management System",
@@ -16,8 +29,13 @@ def main():
     )
     
     # Initialize data managers
-    data_manager = DataManager()
-    task_manager = TaskConfigManager()
+    data_manager = get_data_manager()
+    task_manager = get_task_manager()
+    
+    # Load shared data once per script run
+    immersion_df = data_manager.load_immersion_data()
+    enabled_tasks = task_manager.get_enabled_tasks()
+    today = date.today()
     
     # Main title
     st.title("📚 Study Progress Management System")
@@ -29,19 +47,54 @@ def main():
         "⚙️ Task Settings", "📈 Detailed Analytics"
     ])
     
+    # Tabs 2-4 are fragments, so their own widgets rerun only that tab
     with tab1:
-        show_task_progress_visualization(data_manager, task_manager)
+        show_task_progress_visualization(data_manager, task_manager, immersion_df, enabled_tasks, today)
     
     with tab2:
-        manage_custom_tasks(task_manager)
+        manage_custom_tasks(task_manager, enabled_tasks)
     
     with tab3:
         task_settings(task_manager)
     
     with tab4:
-        show_detailed_analytics(data_manager, task_manager)
+        show_detailed_analytics(data_manager, task_manager, immersion_df, enabled_tasks)
+
+@st.fragment
+def show_recent_immersion_entries(data_manager, immersion_df):
+    """Recent immersion entries with delete buttons; reruns alone on interaction"""
+    st.subheader("Recent Entries")
+    if not immersion_df.empty:
+        recent_entries = immersion_df.iloc[-1:-6:-1]  # Last 5, newest first
+        
+        for row in recent_entries.itertuples(index=False):
+            with st.container():
+                col_date, col_time, col_actions = st.columns([2, 2, 1])
+                
+                with col_date:
+                    st.write(f"**{row.date.strftime('%m/%d')}**")
+                    if row.notes:
+                        st.caption(row.notes)
+                
+                with col_time:
+                    st.write(format_time(row.minutes))
+                
+                with col_actions:
+                    # Delete button
+                    if st.button("🗑️", key=f"delete_{row.date.isoformat()}", help="Delete entry"):
+                        success = data_manager.delete_immersion_entry(row.date)
+                        if success:
+                            st.success("Entry deleted!")
+                            # Full rerun so the totals and charts pick up the change
+                            st.rerun()
+                        else:
+                            st.error("Failed to delete entry")
+                
+                st.divider()
+    else:
+        st.info("No study sessions logged yet.")
 
-def show_task_progress_visualization(data_manager, task_manager):
+def show_task_progress_visualization(data_manager, task_manager, immersion_df, enabled_tasks, today):
     """Display progress bars, goal completion, and study time logging"""
     
     # Study Time Input Section
@@ -53,8 +106,8 @@ def show_task_progress_visualization(data_manager, task_manager):
         with st.form("log_study_form"):
             study_date = st.date_input(
                 "Study Date",
-                value=date.today(),
-                max_value=date.today()
+                value=today,
+                max_value=today
             )
             
             col_hours, col_minutes = st.columns(2)
@@ -82,45 +135,20 @@ def show_task_progress_visualization(data_manager, task_manager):
     
     with col2:
         # Recent entries with delete functionality
-        st.subheader("Recent Entries")
-        immersion_df = data_manager.load_immersion_data()
-        if not immersion_df.empty:
-            recent_entries = immersion_df.tail(5).iloc[::-1]  # Last 5, reversed
-            
-            for idx, row in recent_entries.iterrows():
-                with st.container():
-                    col_date, col_time, col_actions = st.columns([2, 2, 1])
-                    
-                    with col_date:
-                        st.write(f"**{row['date'].strftime('%m/%d')}**")
-                        if row['notes']:
-                            st.caption(row['notes'])
-                    
-                    with col_time:
-                        st.write(format_time(row['minutes']))
-                    
-                    with col_actions:
-                        # Delete button
-                        if st.button("🗑️", key=f"delete_{idx}", help="Delete entry"):
-                            success = data_manager.delete_immersion_entry(row['date'])
-                            if success:
-                                st.success("Entry deleted!")
-                                st.rerun()
-                            else:
-                                st.error("Failed to delete entry")
-                    
-                    st.divider()
-        else:
-            st.info("No study sessions logged yet.")
+        show_recent_immersion_entries(data_manager, immersion_df)
     
     # Progress Bars Section
     st.header("📊 Progress Bars")
     
-    # Load current data
-    immersion_df = data_manager.load_immersion_data()
-    total_minutes = immersion_df['minutes'].sum() if not immersion_df.empty else 0
-    total_hours = total_minutes / 60
-    progress_percentage = calculate_progress_percentage(total_minutes, 60000)
+    # All immersion scalars come from one cached summary lookup
+    immersion_summary = data_manager.get_immersion_summary()
+    total_hours, remaining_hours, days_studied, average_daily, progress_percentage = (
+        immersion_summary['total_hours'], immersion_summary['remaining_hours'],
+        immersion_summary['days_studied'], immersion_summary['average_daily'],
+        immersion_summary['progress_percentage']
+    )
+    # The goal display (progress bar, metric) stops at 100%
+    progress_percentage = min(progress_percentage, 100.0)
     
     # Immersion progress bar
     st.subheader("Immersion Study Progress")
@@ -128,25 +156,25 @@ def show_task_progress_visualization(data_manager, task_manager):
     
     with progress_bar_col:
         st.progress(progress_percentage / 100, text=f"Progress: {progress_percentage:.1f}% of 1000h goal")
-        st.write(f"**{total_hours:.1f}h** completed • **{1000 - total_hours:.1f}h** remaining")
+        st.write(f"**{total_hours:.1f}h** completed • **{remaining_hours:.1f}h** remaining")
     
     with metrics_col:
         st.metric("Total Hours", f"{total_hours:.1f}h")
-        if not immersion_df.empty:
-            avg_session = immersion_df['minutes'].mean()
-            st.metric("Avg Session", format_time(avg_session))
+        if days_studied > 0:
+            st.metric("Avg Session", format_time(average_daily))
     
     # Custom Tasks Progress Bars
-    custom_tasks = task_manager.get_enabled_tasks()
+    custom_tasks = enabled_tasks
+    task_summaries = task_manager.get_all_task_summaries(custom_tasks)
     if custom_tasks:
         st.subheader("Custom Tasks Progress")
         
         for task in custom_tasks:
-            task_data = task_manager.load_task_data(task['id'])
+            summary = task_summaries[task['id']]
             
-            if not task_data.empty:
-                total_value = task_data['value'].sum()
-                task_progress = min((total_value / task['target']) * 100, 100)
+            if summary['days_logged'] > 0:
+                total_value = summary['total_value']
+                task_progress = min(summary['progress_percentage'], 100)
                 
                 progress_bar_col, metrics_col = st.columns([3, 1])
                 
@@ -160,9 +188,7 @@ def show_task_progress_visualization(data_manager, task_manager):
                 
                 with metrics_col:
                     st.metric(f"Total {task['unit']}", f"{total_value:.1f}")
-                    if len(task_data) > 0:
-                        avg_value = task_data['value'].mean()
-                        st.metric("Daily Avg", f"{avg_value:.1f}")
+                    st.metric("Daily Avg", f"{summary['average_daily']:.1f}")
             else:
                 st.progress(0, text=f"{task['name']}: 0% of {task['target']} {task['unit']}")
                 st.write(f"**0 {task['unit']}** completed • **{task['target']} {task['unit']}** remaining")
@@ -188,13 +214,11 @@ def show_task_progress_visualization(data_manager, task_manager):
     with col2:
         # Custom tasks completion summary
         if custom_tasks:
-            completed_tasks = 0
-            for task in custom_tasks:
-                task_data = task_manager.load_task_data(task['id'])
-                if not task_data.empty:
-                    total_value = task_data['value'].sum()
-                    if total_value >= task['target']:
-                        completed_tasks += 1
+            completed_tasks = sum(
+                1 for task in custom_tasks
+                if task_summaries[task['id']]['days_logged'] > 0
+                and task_summaries[task['id']]['total_value'] >= task['target']
+            )
             
             completion_rate = (completed_tasks / len(custom_tasks)) * 100
             st.metric("Custom Tasks Completed", f"{completed_tasks}/{len(custom_tasks)}")
@@ -211,17 +235,12 @@ def show_task_progress_visualization(data_manager, task_manager):
     with col3:
         # Overall study streak
         if not immersion_df.empty:
-            # Calculate study streak (consecutive days with entries)
-            dates = immersion_df['date'].sort_values(ascending=False)
-            current_streak = 0
-            today = date.today()
-            
-            for i, study_date in enumerate(dates):
-                expected_date = today - timedelta(days=i)
-                if study_date == expected_date:
-                    current_streak += 1
-                else:
-                    break
+            # Calculate study streak (consecutive days with entries):
+            # the i-th newest entry must be exactly i days old
+            dates = immersion_df['date'].to_numpy(dtype='datetime64[D]')[::-1]
+            days_ago = (np.datetime64(today, 'D') - dates).astype(int)
+            breaks = days_ago != np.arange(len(days_ago))
+            current_streak = int(breaks.argmax()) if breaks.any() else len(days_ago)
             
             st.metric("Study Streak", f"{current_streak} days")
             
@@ -239,62 +258,68 @@ def show_task_progress_visualization(data_manager, task_manager):
 
 
 
-def manage_custom_tasks(task_manager):
+@st.fragment
+def manage_custom_tasks(task_manager, enabled_tasks):
     """Interface for managing custom task progress"""
     st.header("🎯 Custom Task Management")
     
-    # Get enabled tasks
-    enabled_tasks = task_manager.get_enabled_tasks()
-    
     if not enabled_tasks:
         st.info("No custom tasks available. Go to Task Settings to create your first task!")
         return
     
     # Task selector
-    task_options = {task['name']: task['id'] for task in enabled_tasks}
+    # Tasks and summaries come from this rerun's config read; no per-task lookups
+    task_options = {task['name']: task for task in enabled_tasks}
     selected_task_name = st.selectbox("Select Task", list(task_options.keys()))
-    selected_task_id = task_options[selected_task_name]
-    selected_task = task_manager.get_task_by_id(selected_task_id)
+    selected_task = task_options[selected_task_name]
+    selected_task_id = selected_task['id']
+    task_summaries = task_manager.get_all_task_summaries(enabled_tasks)
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader(f"Log Progress: {selected_task['name']}")
         
-        # Date selection
-        selected_date = st.date_input(
-            "Date",
-            value=date.today(),
-            max_value=date.today()
-        )
+        # Read the clock here rather than taking main()'s value, since this
+        # fragment can rerun on its own
+        today = date.today()
         
-        # Value input
-        value = st.number_input(
-            f"Value ({selected_task['unit']})",
-            min_value=0.0,
-            value=0.0,
-            step=1.0 if selected_task['unit'] in ['回', '問', '題', '個', '本', '日'] else 0.1
-        )
-        
-        # Notes
-        notes = st.text_area("Notes (optional)", placeholder="Additional details about this session...")
-        
-        # Submit button
-        if st.button("Log Progress", type="primary"):
-            if value > 0:
-                success = task_manager.add_task_entry(selected_task_id, selected_date, value, notes)
-                if success:
-                    st.success(f"Successfully logged {value} {selected_task['unit']} for {selected_task['name']}")
-                    st.rerun()
+        # Batch the inputs so edits only rerun the script on submit
+        with st.form("log_task_form"):
+            # Date selection
+            selected_date = st.date_input(
+                "Date",
+                value=today,
+                max_value=today
+            )
+            
+            # Value input
+            value = st.number_input(
+                f"Value ({selected_task['unit']})",
+                min_value=0.0,
+                value=0.0,
+                step=1.0 if selected_task['unit'] in ['回', '問', '題', '個', '本', '日'] else 0.1
+            )
+            
+            # Notes
+            notes = st.text_area("Notes (optional)", placeholder="Additional details about this session...")
+            
+            # Submit button
+            if st.form_submit_button("Log Progress", type="primary"):
+                if value > 0:
+                    success = task_manager.add_task_entry(selected_task_id, selected_date, value, notes)
+                    if success:
+                        st.success(f"Successfully logged {value} {selected_task['unit']} for {selected_task['name']}")
+                        st.rerun()
+                    else:
+                        st.error("Failed to log progress. Please try again.")
                 else:
-                    st.error("Failed to log progress. Please try again.")
-            else:
-                st.error("Please enter a valid value.")
+                    st.error("Please enter a valid value.")
     
     with col2:
         # Task summary
         st.subheader("Task Summary")
-        summary = task_manager.get_task_summary(selected_task_id)
+        summary = task_summaries[selected_task_id]
         
         st.metric(
             "Total Progress",
@@ -321,12 +346,14 @@ def manage_custom_tasks(task_manager):
         st.subheader("Recent Entries")
         task_data = task_manager.load_task_data(selected_task_id)
         if not task_data.empty:
-            recent_entries = task_data.tail(5).iloc[::-1]
-            for _, row in recent_entries.iterrows():
-                with st.container():
-                    st.write(f"**{row['date'].strftime('%m/%d')}**: {row['value']:.1f} {selected_task['unit']}")
-                    if row['notes']:
-                        st.caption(row['notes'])
+            recent_entries = task_data.iloc[-1:-6:-1]
+            # One table element instead of a write/caption pair per row
+            recent_view = pd.DataFrame({
+                'Date': [d.strftime('%m/%d') for d in recent_entries['date']],
+                'Value': recent_entries['value'].map('{:.1f}'.format) + f" {selected_task['unit']}",
+                'Notes': recent_entries['notes']
+            })
+            st.dataframe(recent_view, hide_index=True, use_container_width=True)
         else:
             st.info("No entries logged yet.")
     
@@ -342,7 +369,7 @@ def manage_custom_tasks(task_manager):
         # Create comparison chart
         task_comparison_data = []
         for task in enabled_tasks:
-            summary = task_manager.get_task_summary(task['id'])
+            summary = task_summaries[task['id']]
             task_comparison_data.append({
                 'name': task['name'],
                 'progress': summary['progress_percentage'],
@@ -355,42 +382,34 @@ def manage_custom_tasks(task_manager):
         names = [data['name'] for data in task_comparison_data]
         progress_values = [data['progress'] for data in task_comparison_data]
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=names,
-                y=progress_values,
-                text=[f"{val:.1f}%" for val in progress_values],
-                textposition='auto',
-                marker_color=['#4ECDC4', '#FF6B6B', '#45B7D1', '#96CEB4'][:len(names)]
-            )
-        ])
-        
-        fig.update_layout(
-            title="Custom Tasks Progress Comparison",
-            xaxis_title="Tasks",
-            yaxis_title="Completion Percentage (%)",
-            yaxis=dict(range=[0, 100]),
-            height=400,
-            xaxis_tickangle=-45
+        st.plotly_chart(
+            build_task_overview_figure(tuple(names), tuple(progress_values)),
+            use_container_width=True,
+            key="tasks_overview_bar"
         )
         
-        st.plotly_chart(fig, use_container_width=True)
-        
         # Summary statistics
+        progress_array = np.asarray(progress_values, dtype=float)
+        avg_progress = progress_array.mean()
+        completed_tasks = int((progress_array >= 100).sum())
+        active_tasks = int(((progress_array > 0) & (progress_array < 100)).sum())
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            avg_progress = sum(progress_values) / len(progress_values)
             st.metric("Average Progress", f"{avg_progress:.1f}%")
         
         with col2:
-            completed_tasks = len([p for p in progress_values if p >= 100])
             st.metric("Completed Tasks", f"{completed_tasks}/{len(progress_values)}")
         
         with col3:
-            active_tasks = len([p for p in progress_values if 0 < p < 100])
             st.metric("In Progress", f"{active_tasks} tasks")
 
+def set_pending_delete(confirm_key: str, pending: bool):
+    """Button callback that opens or cancels a task delete confirmation"""
+    st.session_state[confirm_key] = pending
+
+@st.fragment
 def task_settings(task_manager):
     """Interface for configuring custom tasks"""
     st.header("⚙️ Task Settings")
@@ -441,8 +460,10 @@ def task_settings(task_manager):
     
     all_tasks = task_manager.get_all_tasks()
     if all_tasks:
+        # Summaries for every row in one batch, looked up by ID in the loop
+        task_summaries = task_manager.get_all_task_summaries(all_tasks)
         for task in all_tasks:
-            summary = task_manager.get_task_summary(task['id'])
+            summary = task_summaries[task['id']]
             status = "✅ Enabled" if task.get('enabled', True) else "❌ Disabled"
             
             col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
@@ -459,23 +480,80 @@ def task_settings(task_manager):
             
             with col4:
                 st.write(status)
-                if st.button("🗑️", key=f"delete_{task['id']}", help="Delete task"):
-                    success = task_manager.delete_task(task['id'])
-                    if success:
-                        st.success("Task deleted!")
-                        st.rerun()
+                # Deleting removes the task's data file, so ask for confirmation;
+                # the pending state is kept in session_state across reruns
+                confirm_key = f"confirm_delete_{task['id']}"
+                if st.session_state.get(confirm_key):
+                    if st.button("Confirm", key=f"confirm_{task['id']}", type="primary"):
+                        st.session_state.pop(confirm_key, None)
+                        success = task_manager.delete_task(task['id'])
+                        if success:
+                            st.success("Task deleted!")
+                            st.rerun()
+                    st.button("Cancel", key=f"cancel_{task['id']}",
+                              on_click=set_pending_delete, args=(confirm_key, False))
+                else:
+                    st.button("🗑️", key=f"delete_{task['id']}", help="Delete task",
+                              on_click=set_pending_delete, args=(confirm_key, True))
             
             st.divider()
     else:
         st.info("No tasks configured yet. Add your first task above!")
 
-def show_detailed_analytics(data_manager, task_manager):
+@st.fragment
+def show_immersion_analytics(immersion_df):
+    """Period-filtered immersion charts; reruns alone when the period changes"""
+    # Time period selector
+    period = st.selectbox("Analysis Period", ["Last 7 days", "Last 30 days", "All time"])
+    
+    # Read the clock here rather than taking main()'s value, since this
+    # fragment can rerun on its own
+    today = date.today()
+    if period == "Last 7 days":
+        cutoff_date = today - timedelta(days=7)
+    elif period == "Last 30 days":
+        cutoff_date = today - timedelta(days=30)
+    else:
+        cutoff_date = None
+    
+    if cutoff_date is None:
+        filtered_df = immersion_df
+    else:
+        # Data is sorted by date, so a binary search finds the window start
+        filtered_df = immersion_df.iloc[immersion_df['date'].searchsorted(cutoff_date):]
+    
+    if not filtered_df.empty:
+        # Figures are cached on the filtered data itself, so they can
+        # never be served for a different snapshot of the file
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(
+                build_study_trend_figure(filtered_df),
+                use_container_width=True,
+                key="daily_trend"
+            )
+        
+        with col2:
+            # Summary chart only, so skip plotly.js interaction handlers
+            st.plotly_chart(
+                build_study_distribution_figure(filtered_df),
+                use_container_width=True,
+                config={'staticPlot': True, 'displayModeBar': False},
+                key="study_dist"
+            )
+        
+        # Statistics; blank cells are skipped by both reductions
+        total_time, avg_daily = filtered_df['minutes'].agg(['sum', 'mean'])
+        st.write(f"**Average daily study time**: {format_time(avg_daily)}")
+        st.write(f"**Total study time in period**: {format_time(total_time)}")
+
+@st.fragment
+def show_detailed_analytics(data_manager, task_manager, immersion_df, enabled_tasks):
     """Show detailed analytics and trends"""
     st.header("Detailed Analytics")
     
-    # Load data
-    immersion_df = data_manager.load_immersion_data()
-    custom_tasks = task_manager.get_enabled_tasks()
+    custom_tasks = enabled_tasks
     
     if immersion_df.empty and not custom_tasks:
         st.info("No data available for analytics. Start logging your study sessions!")
@@ -485,113 +563,57 @@ def show_detailed_analytics(data_manager, task_manager):
     if not immersion_df.empty:
         st.subheader("📊 Immersion Study Analytics")
         
-        # Time period selector
-        period = st.selectbox("Analysis Period", ["Last 7 days", "Last 30 days", "All time"])
-        
-        if period == "Last 7 days":
-            cutoff_date = (datetime.now() - timedelta(days=7)).date()
-            filtered_df = immersion_df[immersion_df['date'] >= cutoff_date]
-        elif period == "Last 30 days":
-            cutoff_date = (datetime.now() - timedelta(days=30)).date()
-            filtered_df = immersion_df[immersion_df['date'] >= cutoff_date]
-        else:
-            filtered_df = immersion_df
-        
-        if not filtered_df.empty:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Daily study time trend
-                fig = px.line(
-                    filtered_df,
-                    x='date',
-                    y='minutes',
-                    title='Daily Study Time Trend',
-                    labels={'minutes': 'Minutes', 'date': 'Date'}
-                )
-                fig.update_traces(mode='lines+markers')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Study time distribution
-                fig = px.histogram(
-                    filtered_df,
-                    x='minutes',
-                    nbins=20,
-                    title='Study Time Distribution',
-                    labels={'minutes': 'Minutes per Session', 'count': 'Frequency'}
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Statistics
-            avg_daily = filtered_df['minutes'].mean()
-            total_time = filtered_df['minutes'].sum()
-            st.write(f"**Average daily study time**: {format_time(avg_daily)}")
-            st.write(f"**Total study time in period**: {format_time(total_time)}")
-    
-
+        show_immersion_analytics(immersion_df)
     
     # Custom tasks analytics
-    custom_tasks = task_manager.get_enabled_tasks()
     if custom_tasks:
         st.subheader("🎯 Custom Tasks Analytics")
         
         # Allow user to select which custom task to analyze
-        task_options = {task['name']: task['id'] for task in custom_tasks}
+        task_options = {task['name']: task for task in custom_tasks}
         if task_options:
             selected_task_name = st.selectbox("Select Custom Task for Analysis", list(task_options.keys()))
-            selected_task_id = task_options[selected_task_name]
-            selected_task = task_manager.get_task_by_id(selected_task_id)
+            selected_task = task_options[selected_task_name]
+            selected_task_id = selected_task['id']
             
             task_data = task_manager.load_task_data(selected_task_id)
             if not task_data.empty:
-                create_custom_task_charts(task_data, selected_task)
+                create_custom_task_charts(task_data, selected_task, key_prefix="analytics")
             else:
                 st.info(f"No data available for {selected_task['name']}")
     
-    # Data export section
+    # Data export section; export dates come from this fragment's own run
     st.subheader("📁 Data Export")
+    today = date.today()
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Download Immersion Data"):
-            if not immersion_df.empty:
-                csv = immersion_df.to_csv(index=False)
+        if not immersion_df.empty:
+            # CSV bytes are cached until the data file changes
+            st.download_button(
+                label="Download Immersion Data",
+                data=data_manager.get_immersion_csv(),
+                file_name=f"immersion_data_{today.strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
+        else:
+            st.warning("No immersion data to export")
+    
+    with col2:
+        if custom_tasks:
+            # Combined CSV is cached until any task data file changes
+            custom_csv = task_manager.get_combined_task_csv(custom_tasks)
+            if custom_csv:
                 st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=f"immersion_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                    label="Download Custom Task Data",
+                    data=custom_csv,
+                    file_name=f"custom_tasks_data_{today.strftime('%Y%m%d')}.csv",
                     mime="text/csv"
                 )
             else:
-                st.warning("No immersion data to export")
-    
-    with col2:
-        if st.button("Download Custom Task Data"):
-            if custom_tasks:
-                # Export all custom task data as a combined file
-                all_custom_data = []
-                for task in custom_tasks:
-                    task_data = task_manager.load_task_data(task['id'])
-                    if not task_data.empty:
-                        task_data_export = task_data.copy()
-                        task_data_export['task_name'] = task['name']
-                        task_data_export['task_unit'] = task['unit']
-                        all_custom_data.append(task_data_export)
-                
-                if all_custom_data:
-                    combined_df = pd.concat(all_custom_data, ignore_index=True)
-                    csv = combined_df.to_csv(index=False)
-                    st.download_button(
-                        label="Download CSV",
-                        data=csv,
-                        file_name=f"custom_tasks_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv"
-                    )
-                else:
-                    st.warning("No custom task data to export")
-            else:
-                st.warning("No custom tasks configured")
+                st.warning("No custom task data to export")
+        else:
+            st.warning("No custom tasks configured")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,158 @@
 import pandas as pd
 import os
+import streamlit as st
 from datetime import datetime, date
 from typing import Optional
+from storage import file_mtime, parse_dates, write_csv, append_rows
+
+# On-disk schemas
+IMMERSION_COLUMNS = ['date', 'minutes', 'notes']
+TOEIC_COLUMNS = ['date', 'shadowing', 'vocabulary', 'reading', 'total_completed', 'notes']
+
+def _whole_numbers(values: pd.Series, dtype: str) -> pd.Series:
+    """Coerce a numeric column, downcasting only when every cell is a whole number"""
+    # Blank or non-numeric cells become NaN instead of failing the whole load
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().all() and (numbers % 1 == 0).all():
+        return numbers.astype(dtype)
+    return numbers
+
+def _flags(values: pd.Series) -> pd.Series:
+    """Coerce a task flag column to bool; blank cells count as not done"""
+    if values.dtype == bool:
+        return values
+    # Hand-edited cells may mix True/False text with 0/1 numbers
+    text = values.astype(str).str.strip().str.lower()
+    numbers = pd.to_numeric(values, errors='coerce').fillna(0)
+    return text.isin(['true', 'yes']) | (numbers != 0)
+
+def _sort_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace stored dates with date objects, sorting only if the file is out of order"""
+    dates = parse_dates(df['date'])
+    df['date'] = dates.dt.date
+    # Writes keep files date-ordered; only hand-edited files need sorting
+    if not dates.is_monotonic_increasing:
+        df = df.sort_values('date')
+    return df
+
+@st.cache_data(show_spinner=False)
+def _load_immersion(path: str, mtime: int) -> pd.DataFrame:
+    """Read and parse the immersion CSV (cached until the file changes)"""
+    df = pd.read_csv(path, dtype={'notes': str})
+    df['notes'] = df['notes'].fillna('')
+    df['minutes'] = _whole_numbers(df['minutes'], 'int32')
+    if not df.empty:
+        df = _sort_by_date(df)
+    return df
+
+@st.cache_data(show_spinner=False)
+def _load_toeic(path: str, mtime: int) -> pd.DataFrame:
+    """Read and parse the TOEIC CSV (cached until the file changes)"""
+    df = pd.read_csv(path, dtype={'notes': str})
+    df['notes'] = df['notes'].fillna('')
+    # Compact dtypes keep the per-column reductions cheap
+    for col in ['shadowing', 'vocabulary', 'reading']:
+        df[col] = _flags(df[col])
+    flag_count = df[['shadowing', 'vocabulary', 'reading']].sum(axis=1)
+    if 'total_completed' in df.columns:
+        # Blank counts, and older files without the column, are derived from the flags
+        total = pd.to_numeric(df['total_completed'], errors='coerce').fillna(flag_count)
+    else:
+        total = flag_count
+    df['total_completed'] = total.astype('uint8')
+    if not df.empty:
+        df = _sort_by_date(df)
+    return df
+
+# Summaries reported when there is no data, or the file can't be read
+EMPTY_IMMERSION_SUMMARY = {
+    'total_minutes': 0,
+    'total_hours': 0.0,
+    'remaining_hours': 1000.0,
+    'days_studied': 0,
+    'average_daily': 0.0,
+    'progress_percentage': 0.0
+}
+EMPTY_TOEIC_SUMMARY = {
+    'total_days': 0,
+    'shadowing_completion_rate': 0.0,
+    'vocabulary_completion_rate': 0.0,
+    'reading_completion_rate': 0.0,
+    'average_tasks_per_day': 0.0,
+    'recent_average': 0.0
+}
+
+@st.cache_data(show_spinner=False)
+def _immersion_summary(path: str, mtime: int) -> dict:
+    """Aggregate immersion statistics (cached until the file changes)"""
+    df = _load_immersion(path, mtime)
+    
+    if df.empty:
+        return dict(EMPTY_IMMERSION_SUMMARY)
+    
+    # pandas reductions skip blank cells and keep fractional minutes
+    total_minutes = df['minutes'].sum()
+    total_hours = total_minutes / 60
+    
+    return {
+        'total_minutes': total_minutes,
+        'total_hours': total_hours,
+        'remaining_hours': 1000 - total_hours,
+        'days_studied': len(df),
+        'average_daily': df['minutes'].mean(),
+        'progress_percentage': (total_minutes / 60000) * 100  # Goal is 60,000 minutes
+    }
+
+@st.cache_data(show_spinner=False)
+def _toeic_summary(path: str, mtime: int) -> dict:
+    """Aggregate TOEIC statistics (cached until the file changes)"""
+    df = _load_toeic(path, mtime)
+    
+    if df.empty:
+        return dict(EMPTY_TOEIC_SUMMARY)
+    
+    # One reduction over the task and total columns instead of four scans
+    means = df[['shadowing', 'vocabulary', 'reading', 'total_completed']].mean()
+    
+    return {
+        'total_days': len(df),
+        'shadowing_completion_rate': float(means['shadowing'] * 100),
+        'vocabulary_completion_rate': float(means['vocabulary'] * 100),
+        'reading_completion_rate': float(means['reading'] * 100),
+        'average_tasks_per_day': float(means['total_completed']),
+        'recent_average': float(df['total_completed'].tail(7).mean())
+    }
+
+@st.cache_data(show_spinner=False)
+def _immersion_csv(path: str, mtime: int) -> bytes:
+    """Encode immersion data for download (cached until the file changes)"""
+    return _load_immersion(path, mtime).to_csv(index=False).encode('utf-8')
+
+def _clear_immersion_cache():
+    """Drop cached immersion data and aggregates after a write"""
+    _load_immersion.clear()
+    _immersion_summary.clear()
+    _immersion_csv.clear()
+
+def _clear_toeic_cache():
+    """Drop cached TOEIC data and aggregates after a write"""
+    _load_toeic.clear()
+    _toeic_summary.clear()
+
+def _date_rows(df: pd.DataFrame, target: date) -> pd.Index:
+    """Index labels of the rows for a date in date-sorted data"""
+    # Loaded frames are sorted by date, so the matching rows are one
+    # contiguous block found by binary search instead of a full mask
+    start = df['date'].searchsorted(target, side='left')
+    end = df['date'].searchsorted(target, side='right')
+    return df.index[start:end]
+
+def _drop_date(df: pd.DataFrame, target: date) -> Optional[pd.DataFrame]:
+    """Drop rows for a date from date-sorted data, or None if there are none"""
+    rows = _date_rows(df, target)
+    if rows.empty:
+        return None
+    return df.drop(index=rows)
 
 class DataManager:
     """Handles all data operations for the study progress system"""
@@ -15,57 +166,64 @@ class DataManager:
         """Create data files if they don't exist"""
         # Create immersion data file
         if not os.path.exists(self.immersion_file):
-            immersion_df = pd.DataFrame(columns=['date', 'minutes', 'notes'])
+            immersion_df = pd.DataFrame(columns=IMMERSION_COLUMNS)
             immersion_df.to_csv(self.immersion_file, index=False)
         
         # Create TOEIC data file
         if not os.path.exists(self.toeic_file):
-            toeic_df = pd.DataFrame(columns=[
-                'date', 'shadowing', 'vocabulary', 'reading', 'total_completed', 'notes'
-            ])
+            toeic_df = pd.DataFrame(columns=TOEIC_COLUMNS)
             toeic_df.to_csv(self.toeic_file, index=False)
     
+    def _data_mtime(self, path: str) -> int:
+        """Modification time of a data file, recreating the files if one went missing"""
+        # The manager is shared across reruns, so a file deleted while the app
+        # runs has to be restored here rather than only at construction
+        try:
+            return file_mtime(path)
+        except FileNotFoundError:
+            self._ensure_data_files()
+            return file_mtime(path)
+    
+    def _read_immersion(self) -> pd.DataFrame:
+        """Load immersion data for a write; errors propagate so a failed read never overwrites the file"""
+        return _load_immersion(self.immersion_file, self._data_mtime(self.immersion_file))
+    
+    def _read_toeic(self) -> pd.DataFrame:
+        """Load TOEIC data for a write; errors propagate so a failed read never overwrites the file"""
+        return _load_toeic(self.toeic_file, self._data_mtime(self.toeic_file))
+    
     def load_immersion_data(self) -> pd.DataFrame:
         """Load immersion study data from CSV"""
         try:
-            df = pd.read_csv(self.immersion_file)
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date']).dt.date
-                df = df.sort_values('date')
-            return df
+            return self._read_immersion()
         except Exception as e:
             print(f"Error loading immersion data: {e}")
-            return pd.DataFrame(columns=['date', 'minutes', 'notes'])
+            return pd.DataFrame(columns=IMMERSION_COLUMNS)
+    
+    def get_immersion_csv(self) -> bytes:
+        """Get immersion data encoded as CSV for export"""
+        return _immersion_csv(self.immersion_file, self._data_mtime(self.immersion_file))
     
     def load_toeic_data(self) -> pd.DataFrame:
         """Load TOEIC task data from CSV"""
         try:
-            df = pd.read_csv(self.toeic_file)
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date']).dt.date
-                df = df.sort_values('date')
-                # Ensure boolean columns are properly typed
-                for col in ['shadowing', 'vocabulary', 'reading']:
-                    df[col] = df[col].astype(bool)
-            return df
+            return self._read_toeic()
         except Exception as e:
             print(f"Error loading TOEIC data: {e}")
-            return pd.DataFrame(columns=[
-                'date', 'shadowing', 'vocabulary', 'reading', 'total_completed', 'notes'
-            ])
+            return pd.DataFrame(columns=TOEIC_COLUMNS)
     
     def add_immersion_entry(self, study_date: date, minutes: int, notes: str = "") -> bool:
         """Add or update an immersion study entry"""
         try:
-            df = self.load_immersion_data()
+            df = self._read_immersion()
             
             # Check if entry for this date already exists
-            existing_mask = df['date'] == study_date
+            existing_rows = _date_rows(df, study_date)
             
-            if existing_mask.any():
-                # Update existing entry
-                df.loc[existing_mask, 'minutes'] = minutes
-                df.loc[existing_mask, 'notes'] = str(notes)
+            if not existing_rows.empty:
+                # Update existing entry; the date order is unchanged
+                df.loc[existing_rows, 'minutes'] = minutes
+                df.loc[existing_rows, 'notes'] = str(notes)
             else:
                 # Add new entry
                 new_entry = pd.DataFrame({
@@ -73,51 +231,41 @@ class DataManager:
                     'minutes': [minutes],
                     'notes': [notes]
                 })
-                df = pd.concat([df, new_entry], ignore_index=True)
+                # Insert at the date's sorted position rather than re-sorting;
+                # entries after the latest date are appended to the file as is
+                position = df['date'].searchsorted(study_date)
+                if position == len(df) and append_rows(self.immersion_file, new_entry):
+                    _clear_immersion_cache()
+                    return True
+                df = pd.concat([df.iloc[:position], new_entry, df.iloc[position:]], ignore_index=True)
             
-            # Sort by date and save
-            df = df.sort_values('date')
-            df.to_csv(self.immersion_file, index=False)
+            write_csv(df, self.immersion_file)
+            _clear_immersion_cache()
             return True
             
         except Exception as e:
             print(f"Error adding immersion entry: {e}")
             return False
 
-    def delete_immersion_entry(self, entry_date: date) -> bool:
-        """Delete an immersion study entry"""
-        try:
-            df = self.load_immersion_data()
-            
-            # Remove entry with matching date
-            df = df[df['date'] != entry_date]
-            
-            # Save updated data
-            df.to_csv(self.immersion_file, index=False)
-            return True
-        except Exception as e:
-            print(f"Error deleting immersion entry: {e}")
-            return False
-    
     def add_toeic_entry(self, task_date: date, shadowing: bool, vocabulary: bool, 
                        reading: bool, notes: str = "") -> bool:
         """Add or update a TOEIC task entry"""
         try:
-            df = self.load_toeic_data()
+            df = self._read_toeic()
             
             # Calculate total completed tasks
             total_completed = sum([shadowing, vocabulary, reading])
             
             # Check if entry for this date already exists
-            existing_mask = df['date'] == task_date
+            existing_rows = _date_rows(df, task_date)
             
-            if existing_mask.any():
-                # Update existing entry
-                df.loc[existing_mask, 'shadowing'] = shadowing
-                df.loc[existing_mask, 'vocabulary'] = vocabulary
-                df.loc[existing_mask, 'reading'] = reading
-                df.loc[existing_mask, 'total_completed'] = total_completed
-                df.loc[existing_mask, 'notes'] = notes
+            if not existing_rows.empty:
+                # Update existing entry; the date order is unchanged
+                df.loc[existing_rows, 'shadowing'] = shadowing
+                df.loc[existing_rows, 'vocabulary'] = vocabulary
+                df.loc[existing_rows, 'reading'] = reading
+                df.loc[existing_rows, 'total_completed'] = total_completed
+                df.loc[existing_rows, 'notes'] = notes
             else:
                 # Add new entry
                 new_entry = pd.DataFrame({
@@ -128,11 +276,16 @@ class DataManager:
                     'total_completed': [total_completed],
                     'notes': [notes]
                 })
-                df = pd.concat([df, new_entry], ignore_index=True)
+                # Insert at the date's sorted position rather than re-sorting;
+                # entries after the latest date are appended to the file as is
+                position = df['date'].searchsorted(task_date)
+                if position == len(df) and append_rows(self.toeic_file, new_entry):
+                    _clear_toeic_cache()
+                    return True
+                df = pd.concat([df.iloc[:position], new_entry, df.iloc[position:]], ignore_index=True)
             
-            # Sort by date and save
-            df = df.sort_values('date')
-            df.to_csv(self.toeic_file, index=False)
+            write_csv(df, self.toeic_file)
+            _clear_toeic_cache()
             return True
             
         except Exception as e:
@@ -141,64 +294,29 @@ class DataManager:
     
     def get_immersion_summary(self) -> dict:
         """Get summary statistics for immersion study"""
-        df = self.load_immersion_data()
-        
-        if df.empty:
-            return {
-                'total_minutes': 0,
-                'total_hours': 0,
-                'days_studied': 0,
-                'average_daily': 0,
-                'progress_percentage': 0
-            }
-        
-        total_minutes = df['minutes'].sum()
-        total_hours = total_minutes / 60
-        days_studied = len(df)
-        average_daily = df['minutes'].mean()
-        progress_percentage = (total_minutes / 60000) * 100  # Goal is 60,000 minutes
-        
-        return {
-            'total_minutes': total_minutes,
-            'total_hours': total_hours,
-            'days_studied': days_studied,
-            'average_daily': average_daily,
-            'progress_percentage': progress_percentage
-        }
+        try:
+            return _immersion_summary(self.immersion_file, self._data_mtime(self.immersion_file))
+        except Exception as e:
+            print(f"Error loading immersion data: {e}")
+            return dict(EMPTY_IMMERSION_SUMMARY)
     
     def get_toeic_summary(self) -> dict:
         """Get summary statistics for TOEIC tasks"""
-        df = self.load_toeic_data()
-        
-        if df.empty:
-            return {
-                'total_days': 0,
-                'shadowing_completion_rate': 0,
-                'vocabulary_completion_rate': 0,
-                'reading_completion_rate': 0,
-                'average_tasks_per_day': 0
-            }
-        
-        total_days = len(df)
-        shadowing_rate = df['shadowing'].mean() * 100
-        vocabulary_rate = df['vocabulary'].mean() * 100
-        reading_rate = df['reading'].mean() * 100
-        avg_tasks = df['total_completed'].mean()
-        
-        return {
-            'total_days': total_days,
-            'shadowing_completion_rate': shadowing_rate,
-            'vocabulary_completion_rate': vocabulary_rate,
-            'reading_completion_rate': reading_rate,
-            'average_tasks_per_day': avg_tasks
-        }
+        try:
+            return _toeic_summary(self.toeic_file, self._data_mtime(self.toeic_file))
+        except Exception as e:
+            print(f"Error loading TOEIC data: {e}")
+            return dict(EMPTY_TOEIC_SUMMARY)
     
     def delete_immersion_entry(self, study_date: date) -> bool:
         """Delete an immersion entry for a specific date"""
         try:
-            df = self.load_immersion_data()
-            df = df[df['date'] != study_date]
-            df.to_csv(self.immersion_file, index=False)
+            df = self._read_immersion()
+            df = _drop_date(df, study_date)
+            if df is None:
+                return True
+            write_csv(df, self.immersion_file)
+            _clear_immersion_cache()
             return True
         except Exception as e:
             print(f"Error deleting immersion entry: {e}")
@@ -207,9 +325,12 @@ class DataManager:
     def delete_toeic_entry(self, task_date: date) -> bool:
         """Delete a TOEIC entry for a specific date"""
         try:
-            df = self.load_toeic_data()
-            df = df[df['date'] != task_date]
-            df.to_csv(self.toeic_file, index=False)
+            df = self._read_toeic()
+            df = _drop_date(df, task_date)
+            if df is None:
+                return True
+            write_csv(df, self.toeic_file)
+            _clear_toeic_cache()
             return True
         except Exception as e:
             print(f"Error deleting TOEIC entry: {e}")
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+import pandas as pd
+
+# Dates are stored as ISO strings in every data file
+DATE_FORMAT = '%Y-%m-%d'
+
+def file_mtime(path: str) -> int:
+    """Modification time of a data file, used as a cache key"""
+    return os.stat(path).st_mtime_ns
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Parse stored dates, falling back to format inference for hand-edited files"""
+    try:
+        return pd.to_datetime(values, format=DATE_FORMAT)
+    except ValueError:
+        return pd.to_datetime(values, format='mixed')
+
+def _replace_file(path: str, write):
+    """Write a file through a uniquely named temporary file and rename it into place"""
+    # A crash mid-write leaves the previous file in place instead of a torn one,
+    # and concurrent writers never share a temporary file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def write_csv(df: pd.DataFrame, path: str):
+    """Rewrite a data file atomically"""
+    _replace_file(path, lambda f: df.to_csv(f, index=False))
+
+def write_json(data: dict, path: str):
+    """Rewrite a JSON file atomically"""
+    _replace_file(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+
+def append_rows(path: str, rows: pd.DataFrame) -> bool:
+    """Append rows to an existing CSV without rewriting it; False if not possible"""
+    # Only append when the header matches and the file ends on a complete
+    # line; anything else falls back to a full rewrite
+    try:
+        with open(path, 'rb') as f:
+            header = f.readline().decode('utf-8').strip().split(',')
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                return False
+    except (OSError, UnicodeDecodeError):
+        return False
+    if sorted(header) != sorted(rows.columns):
+        return False
+    rows[header].to_csv(path, mode='a', header=False, index=False)
+    return True
@@ -1,8 +1,98 @@
 import json
 import os
+import numpy as np
 import pandas as pd
+import streamlit as st
 from datetime import datetime, date
 from typing import List, Dict, Optional
+from storage import file_mtime, parse_dates, write_csv, write_json, append_rows
+
+# Units offered for custom tasks; the set backs validation lookups
+AVAILABLE_UNITS = ("分", "時間", "回", "問", "題", "ページ", "章", "個", "本", "日")
+_AVAILABLE_UNIT_SET = frozenset(AVAILABLE_UNITS)
+
+# Task IDs are the lower-cased name with ASCII and full-width spaces as underscores
+_SLUG_TABLE = str.maketrans({" ": "_", "\u3000": "_"})
+
+@st.cache_data(show_spinner=False)
+def _load_task_data(path: str, mtime: int) -> pd.DataFrame:
+    """Read and parse a task data CSV (cached until the file changes)"""
+    df = pd.read_csv(path, dtype={'notes': str})
+    df['notes'] = df['notes'].fillna('')
+    # value stays float64: float32 would not round-trip decimal values
+    # like 0.1 through the CSV once new float64 rows are appended. Blank or
+    # non-numeric cells in hand-edited files become NaN instead of failing
+    df['value'] = pd.to_numeric(df['value'], errors='coerce').astype('float64')
+    if not df.empty:
+        dates = parse_dates(df['date'])
+        df['date'] = dates.dt.date
+        # Writes keep files date-ordered; only hand-edited files need sorting
+        if not dates.is_monotonic_increasing:
+            df = df.sort_values('date')
+    return df
+
+@st.cache_data(show_spinner=False)
+def _task_totals(path: str, mtime: int) -> tuple:
+    """Total, entry count and mean of a task's values (cached until the file changes)"""
+    values = _load_task_data(path, mtime)['value'].to_numpy(dtype=np.float64)
+    # Blank cells are skipped, matching the grouped sum/count/mean in _all_task_totals
+    count = int(np.count_nonzero(~np.isnan(values)))
+    if count == 0:
+        return 0, 0, 0
+    # The mean follows from the total
+    total = float(np.nansum(values))
+    return total, count, total / count
+
+@st.cache_data(show_spinner=False)
+def _all_task_totals(sources: tuple) -> Dict[str, tuple]:
+    """Totals for several tasks from one grouped reduction (cached until any file changes)"""
+    values = pd.concat(
+        {task_id: _load_task_data(path, mtime)['value'] for task_id, path, mtime in sources}
+    )
+    stats = values.groupby(level=0).agg(['sum', 'count', 'mean'])
+    return {
+        task_id: (float(total), int(count), float(mean))
+        for task_id, (total, count, mean) in zip(stats.index, stats.to_numpy())
+    }
+
+@st.cache_data(show_spinner=False)
+def _combined_task_csv(sources: tuple) -> bytes:
+    """Encode every task's data as one CSV (cached until any file changes)"""
+    all_custom_data, names, units = [], [], []
+    for path, mtime, name, unit in sources:
+        task_data = _load_task_data(path, mtime)
+        if not task_data.empty:
+            all_custom_data.append(task_data)
+            names.append(name)
+            units.append(unit)
+    
+    if not all_custom_data:
+        return b''
+    # Concatenate once, then fill the label columns in a single pass each
+    # instead of copying every task frame to tag it
+    combined_df = pd.concat(all_custom_data, ignore_index=True)
+    lengths = [len(task_data) for task_data in all_custom_data]
+    combined_df['task_name'] = np.repeat(names, lengths)
+    combined_df['task_unit'] = np.repeat(units, lengths)
+    return combined_df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _load_config(path: str, mtime: int) -> Dict:
+    """Read the task configuration JSON (cached until the file changes)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@st.cache_data(show_spinner=False)
+def _task_index(path: str, mtime: int) -> Dict[str, Dict]:
+    """Configured tasks keyed by ID (cached until the config file changes)"""
+    return {task["id"]: task for task in _load_config(path, mtime).get("tasks", [])}
+
+def _clear_task_caches():
+    """Drop cached task data and aggregates after a write"""
+    _load_task_data.clear()
+    _task_totals.clear()
+    _all_task_totals.clear()
+    _combined_task_csv.clear()
 
 class TaskConfigManager:
     """Manages custom task configurations and their data"""
@@ -60,11 +150,20 @@ class TaskConfigManager:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
+    def _config_mtime(self) -> int:
+        """Modification time of the config file, recreating it if it went missing"""
+        # The manager is shared across reruns, so a config deleted while the app
+        # runs has to be restored here rather than only at construction
+        try:
+            return file_mtime(self.config_file)
+        except FileNotFoundError:
+            self._ensure_config_file()
+            return file_mtime(self.config_file)
+    
     def load_config(self) -> Dict:
         """Load task configuration from file"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_config(self.config_file, self._config_mtime())
         except Exception as e:
             print(f"Error loading config: {e}")
             return {"tasks": []}
@@ -72,8 +171,9 @@ class TaskConfigManager:
     def save_config(self, config: Dict) -> bool:
         """Save task configuration to file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            write_json(config, self.config_file)
+            _load_config.clear()
+            _task_index.clear()
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -91,11 +191,11 @@ class TaskConfigManager:
     
     def get_task_by_id(self, task_id: str) -> Optional[Dict]:
         """Get a specific task by ID"""
-        tasks = self.get_all_tasks()
-        for task in tasks:
-            if task["id"] == task_id:
-                return task
-        return None
+        try:
+            return _task_index(self.config_file, self._config_mtime()).get(task_id)
+        except Exception as e:
+            print(f"Error loading config: {e}")
+            return None
     
     def add_task(self, name: str, unit: str, target: int) -> bool:
         """Add a new task"""
@@ -103,8 +203,8 @@ class TaskConfigManager:
             config = self.load_config()
             
             # Generate unique ID
-            task_id = name.lower().replace(" ", "_").replace("　", "_")
-            existing_ids = [task["id"] for task in config["tasks"]]
+            task_id = name.lower().translate(_SLUG_TABLE)
+            existing_ids = {task["id"] for task in config["tasks"]}
             
             counter = 1
             original_id = task_id
@@ -165,6 +265,7 @@ class TaskConfigManager:
             data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
             if os.path.exists(data_file):
                 os.remove(data_file)
+                _clear_task_caches()
             
             return self.save_config(config)
         except Exception as e:
@@ -173,33 +274,41 @@ class TaskConfigManager:
     
     def _create_task_data_file(self, task_id: str):
         """Create empty data file for a task"""
+        self._ensure_data_directory()
         data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
         if not os.path.exists(data_file):
             df = pd.DataFrame(columns=['date', 'value', 'notes'])
             df.to_csv(data_file, index=False)
     
-    def load_task_data(self, task_id: str) -> pd.DataFrame:
-        """Load data for a specific task"""
+    def _read_task_data(self, task_id: str) -> pd.DataFrame:
+        """Load task data for a write; errors propagate so a failed read never overwrites the file"""
         data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
         
         if not os.path.exists(data_file):
             self._create_task_data_file(task_id)
         
+        return _load_task_data(data_file, file_mtime(data_file))
+    
+    def load_task_data(self, task_id: str) -> pd.DataFrame:
+        """Load data for a specific task"""
         try:
-            df = pd.read_csv(data_file)
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date']).dt.date
-                df = df.sort_values('date')
-            return df
+            return self._read_task_data(task_id)
         except Exception as e:
             print(f"Error loading task data for {task_id}: {e}")
             return pd.DataFrame(columns=['date', 'value', 'notes'])
     
+    def get_combined_task_csv(self, tasks: List[Dict]) -> bytes:
+        """Get the data of the given tasks as one CSV for export (empty if none)"""
+        sources = tuple((*self._task_data_source(task['id']), task['name'], task['unit'])
+                        for task in tasks)
+        return _combined_task_csv(sources)
+    
     def save_task_data(self, task_id: str, df: pd.DataFrame) -> bool:
         """Save data for a specific task"""
         try:
             data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
-            df.to_csv(data_file, index=False)
+            write_csv(df, data_file)
+            _clear_task_caches()
             return True
         except Exception as e:
             print(f"Error saving task data for {task_id}: {e}")
@@ -208,15 +317,17 @@ class TaskConfigManager:
     def add_task_entry(self, task_id: str, entry_date: date, value: float, notes: str = "") -> bool:
         """Add or update an entry for a task"""
         try:
-            df = self.load_task_data(task_id)
+            df = self._read_task_data(task_id)
             
-            # Check if entry for this date already exists
-            existing_mask = df['date'] == entry_date
+            # Check if entry for this date already exists; loaded data is
+            # date-sorted, so the matching rows are found by binary search
+            start = df['date'].searchsorted(entry_date, side='left')
+            end = df['date'].searchsorted(entry_date, side='right')
             
-            if existing_mask.any():
-                # Update existing entry
-                df.loc[existing_mask, 'value'] = value
-                df.loc[existing_mask, 'notes'] = notes
+            if start < end:
+                # Update existing entry; the date order is unchanged
+                df.loc[df.index[start:end], 'value'] = value
+                df.loc[df.index[start:end], 'notes'] = notes
             else:
                 # Add new entry
                 new_entry = pd.DataFrame({
@@ -224,24 +335,92 @@ class TaskConfigManager:
                     'value': [value],
                     'notes': [notes]
                 })
-                df = pd.concat([df, new_entry], ignore_index=True)
+                # Insert at the date's sorted position rather than re-sorting;
+                # entries after the latest date are appended to the file as is
+                data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
+                if start == len(df) and append_rows(data_file, new_entry):
+                    _clear_task_caches()
+                    return True
+                df = pd.concat([df.iloc[:start], new_entry, df.iloc[start:]], ignore_index=True)
             
-            # Sort by date and save
-            df = df.sort_values('date')
             return self.save_task_data(task_id, df)
         except Exception as e:
             print(f"Error adding task entry: {e}")
             return False
     
+    def add_task_entries(self, task_id: str, rows: List[tuple]) -> bool:
+        """Add or update several (date, value, notes) entries for a task with one write"""
+        if not rows:
+            return True
+        
+        try:
+            df = self._read_task_data(task_id)
+            new_entries = pd.DataFrame(rows, columns=['date', 'value', 'notes'])
+            new_entries['value'] = new_entries['value'].astype('float64')
+            new_entries['notes'] = new_entries['notes'].fillna('')
+            # Later rows for the same date win, as with repeated add_task_entry calls
+            new_entries = new_entries.drop_duplicates(subset='date', keep='last')
+            new_entries = new_entries.sort_values('date', kind='stable')
+            
+            # A batch entirely after the latest date is appended to the file as is
+            data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
+            after_latest = df.empty or new_entries['date'].iloc[0] > df['date'].iloc[-1]
+            if after_latest and append_rows(data_file, new_entries):
+                _clear_task_caches()
+                return True
+            
+            df = pd.concat([df, new_entries], ignore_index=True)
+            df = df.drop_duplicates(subset='date', keep='last')
+            df = df.sort_values('date', kind='stable', ignore_index=True)
+            return self.save_task_data(task_id, df)
+        except Exception as e:
+            print(f"Error adding task entries: {e}")
+            return False
+    
     def get_task_summary(self, task_id: str) -> Dict:
         """Get summary statistics for a task"""
         task = self.get_task_by_id(task_id)
         if not task:
             return {}
         
-        df = self.load_task_data(task_id)
+        return self._summarize_task(task)
+    
+    def get_all_task_summaries(self, tasks: Optional[List[Dict]] = None) -> Dict[str, Dict]:
+        """Get summary statistics for the given tasks (default: enabled tasks), keyed by task ID"""
+        if tasks is None:
+            tasks = self.get_enabled_tasks()
+        if not tasks:
+            return {}
+        
+        # One cached grouped reduction covers every task in the batch
+        try:
+            sources = tuple((task['id'], *self._task_data_source(task['id'])) for task in tasks)
+            totals = _all_task_totals(sources)
+        except Exception as e:
+            print(f"Error loading task data: {e}")
+            return {task['id']: self._summarize_task(task) for task in tasks}
+        
+        return {task['id']: self._summarize_task(task, totals.get(task['id'], (0, 0, 0)))
+                for task in tasks}
+    
+    def _task_data_source(self, task_id: str) -> tuple:
+        """Path and modification time of a task's data file, creating it if missing"""
+        data_file = os.path.join(self.data_dir, f"{task_id}_data.csv")
+        if not os.path.exists(data_file):
+            self._create_task_data_file(task_id)
+        return data_file, file_mtime(data_file)
+    
+    def _summarize_task(self, task: Dict, totals: Optional[tuple] = None) -> Dict:
+        """Compute summary statistics from a task's configuration and data"""
+        if totals is None:
+            try:
+                totals = _task_totals(*self._task_data_source(task['id']))
+            except Exception as e:
+                print(f"Error loading task data for {task['id']}: {e}")
+                totals = (0, 0, 0)
+        total_value, days_logged, average_daily = totals
         
-        if df.empty:
+        if days_logged == 0:
             return {
                 'task_name': task['name'],
                 'unit': task['unit'],
@@ -252,10 +431,7 @@ class TaskConfigManager:
                 'average_daily': 0
             }
         
-        total_value = df['value'].sum()
-        days_logged = len(df)
         progress_percentage = (total_value / task['target']) * 100 if task['target'] > 0 else 0
-        average_daily = df['value'].mean()
         
         return {
             'task_name': task['name'],
@@ -269,7 +445,7 @@ class TaskConfigManager:
     
     def get_available_units(self) -> List[str]:
         """Get list of available units"""
-        return ["分", "時間", "回", "問", "題", "ページ", "章", "個", "本", "日"]
+        return list(AVAILABLE_UNITS)
     
     def validate_task_input(self, name: str, unit: str, target: int) -> tuple[bool, str]:
         """Validate task input"""
@@ -279,7 +455,7 @@ class TaskConfigManager:
         if len(name.strip()) > 50:
             return False, "タスク名は50文字以内で入力してください"
         
-        if not unit or unit not in self.get_available_units():
+        if not unit or unit not in _AVAILABLE_UNIT_SET:
             return False, "有効な単位を選択してください"
         
         if target <= 0:
@@ -1,13 +1,38 @@
+from __future__ import annotations
+
 from datetime import datetime, date, timedelta
-import pandas as pd
+from bisect import bisect_right
+from functools import lru_cache
+from typing import TYPE_CHECKING
+import numpy as np
+
+# pandas is only needed for annotations; the helpers work on frames they are handed
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Progress percentages at which the motivation message moves up a level
+_MOTIVATION_THRESHOLDS = (10, 25, 50, 75, 90, 100)
+_MOTIVATION_MESSAGES = (
+    "🌱 Beginning your journey! The first step is always the hardest!",
+    "🚀 Great start! Every hour counts towards your goal!",
+    "🌟 Good momentum! You're building a strong foundation!",
+    "⚡ Halfway there! Keep up the excellent work!",
+    "💪 Great progress! You're in the final stretch!",
+    "🔥 Almost there! Just a little more to reach your goal!",
+    "🎉 Congratulations! You've achieved your 1000-hour goal!",
+)
 
 def format_time(minutes: float) -> str:
     """Format minutes into a human-readable time string"""
+    return _format_whole_minutes(int(minutes))
+
+@lru_cache(maxsize=4096)
+def _format_whole_minutes(minutes: int) -> str:
+    """Format a whole number of minutes; durations repeat, so results are memoized"""
     if minutes < 60:
-        return f"{int(minutes)}m"
+        return f"{minutes}m"
     
-    hours = int(minutes // 60)
-    remaining_minutes = int(minutes % 60)
+    hours, remaining_minutes = divmod(minutes, 60)
     
     if remaining_minutes == 0:
         return f"{hours}h"
@@ -20,6 +45,39 @@ def calculate_progress_percentage(current_minutes: int, target_minutes: int) ->
         return 0.0
     return min((current_minutes / target_minutes) * 100, 100.0)
 
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick n_out representative points with Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    anchor = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the final point) is the third vertex
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[lo:hi] - y[anchor])
+            - (x[anchor] - x[lo:hi]) * (avg_y - y[anchor])
+        )
+        anchor = lo + int(area.argmax())
+        selected[i + 1] = anchor
+    
+    return selected
+
 def get_date_range_options():
     """Get common date range options for filtering"""
     today = date.today()
@@ -36,52 +94,40 @@ def filter_dataframe_by_date_range(df: pd.DataFrame, start_date: date = None, en
     if df.empty:
         return df
     
-    filtered_df = df.copy()
+    dates = df['date']
     
-    if start_date:
-        filtered_df = filtered_df[filtered_df['date'] >= start_date]
+    # Loaded data is date-sorted, so the range is one slice found by binary search
+    if dates.is_monotonic_increasing:
+        start = dates.searchsorted(start_date, side='left') if start_date else 0
+        end = dates.searchsorted(end_date, side='right') if end_date else len(df)
+        return df.iloc[start:end]
     
+    # Unsorted input: one combined mask instead of filtering twice
+    mask = np.ones(len(df), dtype=bool)
+    if start_date:
+        mask &= (dates >= start_date).to_numpy()
     if end_date:
-        filtered_df = filtered_df[filtered_df['date'] <= end_date]
-    
-    return filtered_df
+        mask &= (dates <= end_date).to_numpy()
+    return df[mask]
 
 def calculate_study_streak(df: pd.DataFrame, min_minutes: int = 1) -> dict:
     """Calculate current and longest study streaks"""
     if df.empty:
         return {"current_streak": 0, "longest_streak": 0}
     
-    # Sort by date
-    df_sorted = df.sort_values('date')
-    
-    # Create a complete date range from first to last study date
-    date_range = pd.date_range(
-        start=df_sorted['date'].min(),
-        end=df_sorted['date'].max(),
-        freq='D'
-    ).date
-    
-    # Create a set of study dates that meet minimum requirement
-    study_dates = set(df_sorted[df_sorted['minutes'] >= min_minutes]['date'])
-    
-    # Calculate streaks
-    current_streak = 0
-    longest_streak = 0
-    temp_streak = 0
-    
-    # Start from today and go backwards for current streak
-    current_date = date.today()
-    while current_date in study_dates:
-        current_streak += 1
-        current_date -= timedelta(days=1)
-    
-    # Calculate longest streak
-    for check_date in date_range:
-        if check_date in study_dates:
-            temp_streak += 1
-            longest_streak = max(longest_streak, temp_streak)
-        else:
-            temp_streak = 0
+    # Unique qualifying study days, ascending, as day-resolution datetimes
+    days = np.unique(df.loc[df['minutes'] >= min_minutes, 'date'].to_numpy(dtype='datetime64[D]'))
+    if len(days) == 0:
+        return {"current_streak": 0, "longest_streak": 0}
+    
+    # A new run starts wherever the gap to the previous study day isn't one day
+    breaks = np.flatnonzero(np.diff(days) != np.timedelta64(1, 'D')) + 1
+    run_starts = np.concatenate(([0], breaks))
+    run_lengths = np.diff(np.concatenate((run_starts, [len(days)])))
+    
+    longest_streak = int(run_lengths.max())
+    # The current streak is the last run, if it reaches today
+    current_streak = int(run_lengths[-1]) if days[-1] == np.datetime64(date.today(), 'D') else 0
     
     return {
         "current_streak": current_streak,
@@ -101,15 +147,24 @@ def get_study_statistics(df: pd.DataFrame) -> dict:
             "least_productive_day": None
         }
     
-    total_sessions = len(df)
-    total_minutes = df['minutes'].sum()
+    minutes = df['minutes'].to_numpy()
+    dates = df['date'].to_numpy()
+    
+    # Blank cells are skipped, as pandas' sum/mean/median/idxmax do
+    logged = np.count_nonzero(~np.isnan(minutes))
+    total_sessions = len(minutes)
+    total_minutes = np.nansum(minutes)
     total_hours = total_minutes / 60
-    average_session = df['minutes'].mean()
-    median_session = df['minutes'].median()
+    average_session = total_minutes / logged if logged else np.nan
+    median_session = np.nanmedian(minutes) if logged else np.nan
     
     # Find most and least productive days
-    max_day = df.loc[df['minutes'].idxmax()]
-    min_day = df.loc[df['minutes'].idxmin()]
+    most_productive_day = least_productive_day = None
+    if logged:
+        max_pos = np.nanargmax(minutes)
+        min_pos = np.nanargmin(minutes)
+        most_productive_day = {"date": dates[max_pos], "minutes": minutes[max_pos]}
+        least_productive_day = {"date": dates[min_pos], "minutes": minutes[min_pos]}
     
     return {
         "total_sessions": total_sessions,
@@ -117,14 +172,8 @@ def get_study_statistics(df: pd.DataFrame) -> dict:
         "total_hours": total_hours,
         "average_session": average_session,
         "median_session": median_session,
-        "most_productive_day": {
-            "date": max_day['date'],
-            "minutes": max_day['minutes']
-        },
-        "least_productive_day": {
-            "date": min_day['date'],
-            "minutes": min_day['minutes']
-        }
+        "most_productive_day": most_productive_day,
+        "least_productive_day": least_productive_day
     }
 
 def validate_study_time_input(hours: int, minutes: int) -> tuple[bool, str]:
@@ -149,20 +198,7 @@ def validate_study_time_input(hours: int, minutes: int) -> tuple[bool, str]:
 
 def get_motivation_message(progress_percentage: float) -> str:
     """Get a motivational message based on progress"""
-    if progress_percentage >= 100:
-        return "🎉 Congratulations! You've achieved your 1000-hour goal!"
-    elif progress_percentage >= 90:
-        return "🔥 Almost there! Just a little more to reach your goal!"
-    elif progress_percentage >= 75:
-        return "💪 Great progress! You're in the final stretch!"
-    elif progress_percentage >= 50:
-        return "⚡ Halfway there! Keep up the excellent work!"
-    elif progress_percentage >= 25:
-        return "🌟 Good momentum! You're building a strong foundation!"
-    elif progress_percentage >= 10:
-        return "🚀 Great start! Every hour counts towards your goal!"
-    else:
-        return "🌱 Beginning your journey! The first step is always the hardest!"
+    return _MOTIVATION_MESSAGES[bisect_right(_MOTIVATION_THRESHOLDS, progress_percentage)]
 
 def calculate_estimated_completion_date(current_minutes: int, target_minutes: int, daily_average: float) -> date:
     """Calculate estimated completion date based on current progress and average"""
@@ -177,35 +213,41 @@ def calculate_estimated_completion_date(current_minutes: int, target_minutes: in
 
 def export_data_summary(immersion_df: pd.DataFrame, toeic_df: pd.DataFrame) -> str:
     """Generate a text summary of all data for export"""
-    summary_lines = []
-    summary_lines.append("STUDY PROGRESS SUMMARY")
-    summary_lines.append("=" * 50)
-    summary_lines.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    summary_lines.append("")
+    summary = (
+        f"STUDY PROGRESS SUMMARY\n"
+        f"{'=' * 50}\n"
+        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"\n"
+    )
     
     # Immersion summary
     if not immersion_df.empty:
-        total_minutes = immersion_df['minutes'].sum()
-        total_hours = total_minutes / 60
+        minutes_stats = immersion_df['minutes'].agg(['sum', 'mean'])
+        total_minutes = int(minutes_stats['sum'])
         progress_pct = calculate_progress_percentage(total_minutes, 60000)
         
-        summary_lines.append("IMMERSION STUDY PROGRESS")
-        summary_lines.append("-" * 30)
-        summary_lines.append(f"Total Study Time: {format_time(total_minutes)}")
-        summary_lines.append(f"Progress towards 1000h goal: {progress_pct:.1f}%")
-        summary_lines.append(f"Days studied: {len(immersion_df)}")
-        summary_lines.append(f"Average per session: {format_time(immersion_df['minutes'].mean())}")
-        summary_lines.append("")
+        summary += (
+            f"IMMERSION STUDY PROGRESS\n"
+            f"{'-' * 30}\n"
+            f"Total Study Time: {format_time(total_minutes)}\n"
+            f"Progress towards 1000h goal: {progress_pct:.1f}%\n"
+            f"Days studied: {len(immersion_df)}\n"
+            f"Average per session: {format_time(minutes_stats['mean'])}\n"
+            f"\n"
+        )
     
     # TOEIC summary
     if not toeic_df.empty:
-        summary_lines.append("TOEIC TASK PROGRESS")
-        summary_lines.append("-" * 30)
-        summary_lines.append(f"Total days tracked: {len(toeic_df)}")
-        summary_lines.append(f"Shadowing completion rate: {toeic_df['shadowing'].mean() * 100:.1f}%")
-        summary_lines.append(f"Vocabulary completion rate: {toeic_df['vocabulary'].mean() * 100:.1f}%")
-        summary_lines.append(f"Reading completion rate: {toeic_df['reading'].mean() * 100:.1f}%")
-        summary_lines.append(f"Average tasks per day: {toeic_df['total_completed'].mean():.1f}/3")
-        summary_lines.append("")
-    
-    return "\n".join(summary_lines)
+        means = toeic_df[['shadowing', 'vocabulary', 'reading', 'total_completed']].mean()
+        summary += (
+            f"TOEIC TASK PROGRESS\n"
+            f"{'-' * 30}\n"
+            f"Total days tracked: {len(toeic_df)}\n"
+            f"Shadowing completion rate: {means['shadowing'] * 100:.1f}%\n"
+            f"Vocabulary completion rate: {means['vocabulary'] * 100:.1f}%\n"
+            f"Reading completion rate: {means['reading'] * 100:.1f}%\n"
+            f"Average tasks per day: {means['total_completed']:.1f}/3\n"
+            f"\n"
+        )
+    
+    return summary.removesuffix("\n")
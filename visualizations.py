@@ -1,141 +1,202 @@
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
+from utils import lttb_indices
+
+# Above this many points time series are downsampled before plotting
+MAX_TREND_POINTS = 500
+
+# Above this many days the TOEIC completion bars are stacked per week
+MAX_DAILY_BARS = 120
+
+# (column, label, colour) for each TOEIC task series
+TOEIC_TASK_TRACES = (
+    ('shadowing', 'Shadowing', '#FF6B6B'),
+    ('vocabulary', 'Vocabulary', '#4ECDC4'),
+    ('reading', 'Reading', '#45B7D1'),
+)
+
+# Static layout and palette for the custom task comparison chart
+OVERVIEW_LAYOUT = dict(
+    title="Custom Tasks Progress Comparison",
+    xaxis_title="Tasks",
+    yaxis_title="Completion Percentage (%)",
+    yaxis=dict(range=[0, 100]),
+    height=400,
+    xaxis_tickangle=-45
+)
+OVERVIEW_PALETTE = ('#4ECDC4', '#FF6B6B', '#45B7D1', '#96CEB4')
 
 def create_progress_charts(immersion_df: pd.DataFrame, total_minutes: int):
     """Create progress visualization charts for immersion study"""
     
+    goal_fig, pie_fig = build_goal_figures(total_minutes)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Progress bar chart
         st.subheader("Goal Progress")
-        
-        goal_minutes = 60000  # 1000 hours
-        progress_percentage = (total_minutes / goal_minutes) * 100
-        remaining_percentage = 100 - progress_percentage
-        
-        # Create a horizontal bar chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            y=['Progress'],
-            x=[progress_percentage],
-            orientation='h',
-            name='Completed',
-            marker_color='#2E8B57',
-            text=f'{progress_percentage:.1f}%',
-            textposition='inside'
-        ))
-        
-        fig.add_trace(go.Bar(
-            y=['Progress'],
-            x=[remaining_percentage],
-            orientation='h',
-            name='Remaining',
-            marker_color='#F0F0F0',
-            text=f'{remaining_percentage:.1f}%',
-            textposition='inside'
-        ))
-        
-        fig.update_layout(
-            barmode='stack',
-            xaxis=dict(range=[0, 100], title='Percentage'),
-            yaxis=dict(title=''),
-            height=200,
-            showlegend=True,
-            title="1000-Hour Goal Progress"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(goal_fig, use_container_width=True)
     
     with col2:
         # Pie chart
         st.subheader("Time Distribution")
-        
-        completed_hours = total_minutes / 60
-        remaining_hours = 1000 - completed_hours
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=['Completed', 'Remaining'],
-            values=[completed_hours, remaining_hours],
-            hole=0.4,
-            marker_colors=['#2E8B57', '#F0F0F0']
-        )])
-        
-        fig.update_traces(
-            textposition='inside',
-            textinfo='percent+label'
-        )
-        
-        fig.update_layout(
-            title="Study Time Breakdown",
-            height=300,
-            annotations=[dict(text=f'{completed_hours:.1f}h<br>Completed', 
-                            x=0.5, y=0.5, font_size=16, showarrow=False)]
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(pie_fig, use_container_width=True)
     
-    # Daily study time trend (last 30 days)
     if len(immersion_df) > 1:
-        st.subheader("Daily Study Time Trend")
-        
-        # Get last 30 days of data
-        recent_df = immersion_df.tail(30).copy()
-        recent_df['hours'] = recent_df['minutes'] / 60
-        
-        fig = px.line(
-            recent_df,
-            x='date',
-            y='hours',
-            title='Daily Study Hours (Last 30 Sessions)',
-            labels={'hours': 'Hours', 'date': 'Date'},
-            markers=True
-        )
+        trend_fig, cumulative_fig = build_immersion_trend_figures(immersion_df)
         
-        # Add average line
-        avg_hours = recent_df['hours'].mean()
-        fig.add_hline(
-            y=avg_hours,
-            line_dash="dash",
-            line_color="red",
-            annotation_text=f"Average: {avg_hours:.1f}h"
-        )
+        # Daily study time trend (last 30 days)
+        st.subheader("Daily Study Time Trend")
+        st.plotly_chart(trend_fig, use_container_width=True)
         
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Cumulative progress chart
-    if len(immersion_df) > 1:
+        # Cumulative progress chart
         st.subheader("Cumulative Progress")
-        
-        # Calculate cumulative minutes
-        df_cumulative = immersion_df.copy()
-        df_cumulative['cumulative_minutes'] = df_cumulative['minutes'].cumsum()
-        df_cumulative['cumulative_hours'] = df_cumulative['cumulative_minutes'] / 60
-        df_cumulative['progress_percentage'] = (df_cumulative['cumulative_minutes'] / 60000) * 100
-        
-        fig = px.area(
+        st.plotly_chart(cumulative_fig, use_container_width=True)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_goal_figures(total_minutes: int) -> tuple:
+    """Build the goal progress bar and time distribution pie (cached per total)"""
+    goal_minutes = 60000  # 1000 hours
+    progress_percentage = (total_minutes / goal_minutes) * 100
+    remaining_percentage = 100 - progress_percentage
+    
+    # Create a horizontal bar chart
+    goal_fig = go.Figure()
+    
+    goal_fig.add_trace(go.Bar(
+        y=['Progress'],
+        x=[progress_percentage],
+        orientation='h',
+        name='Completed',
+        marker_color='#2E8B57',
+        text=f'{progress_percentage:.1f}%',
+        textposition='inside'
+    ))
+    
+    goal_fig.add_trace(go.Bar(
+        y=['Progress'],
+        x=[remaining_percentage],
+        orientation='h',
+        name='Remaining',
+        marker_color='#F0F0F0',
+        text=f'{remaining_percentage:.1f}%',
+        textposition='inside'
+    ))
+    
+    goal_fig.update_layout(
+        barmode='stack',
+        xaxis=dict(range=[0, 100], title='Percentage'),
+        yaxis=dict(title=''),
+        height=200,
+        showlegend=True,
+        title="1000-Hour Goal Progress"
+    )
+    
+    completed_hours = total_minutes / 60
+    remaining_hours = 1000 - completed_hours
+    
+    pie_fig = go.Figure(data=[go.Pie(
+        labels=['Completed', 'Remaining'],
+        values=[completed_hours, remaining_hours],
+        hole=0.4,
+        marker_colors=['#2E8B57', '#F0F0F0']
+    )])
+    
+    pie_fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label'
+    )
+    
+    pie_fig.update_layout(
+        title="Study Time Breakdown",
+        height=300,
+        annotations=[dict(text=f'{completed_hours:.1f}h<br>Completed', 
+                        x=0.5, y=0.5, font_size=16, showarrow=False)]
+    )
+    
+    return goal_fig.to_dict(), pie_fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_immersion_trend_figures(immersion_df: pd.DataFrame) -> tuple:
+    """Build the recent daily trend and cumulative progress figures (cached per data)"""
+    # Last 30 sessions as plain arrays; plotly only needs dates and hours
+    recent = immersion_df.tail(30)
+    recent_df = {
+        'date': recent['date'].to_numpy(),
+        'hours': recent['minutes'].to_numpy(dtype=np.float64) / 60
+    }
+    
+    trend_fig = px.line(
+        recent_df,
+        x='date',
+        y='hours',
+        title='Daily Study Hours (Last 30 Sessions)',
+        labels={'hours': 'Hours', 'date': 'Date'},
+        markers=True
+    )
+    
+    # Add average line
+    avg_hours = float(recent_df['hours'].mean())
+    trend_fig.add_hline(
+        y=avg_hours,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Average: {avg_hours:.1f}h"
+    )
+    
+    trend_fig.update_layout(height=400)
+    
+    # One float cumulative sum, converted to hours, without copying the frame;
+    # blank minutes stay gaps and fractional minutes are kept
+    cumulative_minutes = immersion_df['minutes'].cumsum(skipna=True).to_numpy(dtype=np.float64)
+    df_cumulative = {
+        'date': immersion_df['date'].to_numpy(),
+        'cumulative_hours': cumulative_minutes / 60
+    }
+    
+    if len(cumulative_minutes) > MAX_TREND_POINTS:
+        # Long histories are downsampled and rendered as a filled WebGL trace
+        x, y = df_cumulative['date'], df_cumulative['cumulative_hours']
+        # Gaps from blank entries would poison the triangle areas
+        present = ~np.isnan(y)
+        x, y = x[present], y[present]
+        keep = lttb_indices(x.astype('datetime64[D]').astype(np.int64), y, MAX_TREND_POINTS)
+        cumulative_fig = go.Figure(go.Scattergl(
+            x=x[keep],
+            y=y[keep],
+            mode='lines',
+            fill='tozeroy'
+        ))
+        cumulative_fig.update_layout(
+            title='Cumulative Study Hours Over Time',
+            xaxis_title='Date',
+            yaxis_title='Cumulative Hours'
+        )
+    else:
+        cumulative_fig = px.area(
             df_cumulative,
             x='date',
             y='cumulative_hours',
             title='Cumulative Study Hours Over Time',
             labels={'cumulative_hours': 'Cumulative Hours', 'date': 'Date'}
         )
-        
-        # Add goal line
-        fig.add_hline(
-            y=1000,
-            line_dash="dash",
-            line_color="gold",
-            annotation_text="1000 Hour Goal"
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+    
+    # Add goal line
+    cumulative_fig.add_hline(
+        y=1000,
+        line_dash="dash",
+        line_color="gold",
+        annotation_text="1000 Hour Goal"
+    )
+    
+    cumulative_fig.update_layout(height=400)
+    
+    return trend_fig.to_dict(), cumulative_fig.to_dict()
 
 def create_toeic_charts(toeic_df: pd.DataFrame):
     """Create TOEIC task completion visualization charts"""
@@ -144,95 +205,19 @@ def create_toeic_charts(toeic_df: pd.DataFrame):
         st.info("No TOEIC data available for visualization")
         return
     
+    completion_fig, rates_fig = build_toeic_figures(toeic_df)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Task completion heatmap-style chart
         st.subheader("Task Completion Overview")
-        
-        # Prepare data for stacked bar chart
-        task_data = toeic_df[['date', 'shadowing', 'vocabulary', 'reading']].copy()
-        task_data['date_str'] = task_data['date'].astype(str)
-        
-        fig = go.Figure()
-        
-        # Add bars for each task
-        fig.add_trace(go.Bar(
-            name='Shadowing',
-            x=task_data['date_str'],
-            y=task_data['shadowing'].astype(int),
-            marker_color='#FF6B6B'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Vocabulary',
-            x=task_data['date_str'],
-            y=task_data['vocabulary'].astype(int),
-            marker_color='#4ECDC4'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Reading',
-            x=task_data['date_str'],
-            y=task_data['reading'].astype(int),
-            marker_color='#45B7D1'
-        ))
-        
-        fig.update_layout(
-            barmode='stack',
-            title='Daily Task Completion',
-            xaxis_title='Date',
-            yaxis_title='Tasks Completed',
-            height=400,
-            xaxis_tickangle=-45
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(completion_fig, use_container_width=True)
     
     with col2:
         # Completion rate pie charts
         st.subheader("Overall Completion Rates")
-        
-        # Calculate completion rates
-        shadowing_rate = toeic_df['shadowing'].mean()
-        vocabulary_rate = toeic_df['vocabulary'].mean()
-        reading_rate = toeic_df['reading'].mean()
-        
-        rates_data = {
-            'Task': ['Shadowing', 'Vocabulary', 'Reading'],
-            'Completion Rate': [shadowing_rate * 100, vocabulary_rate * 100, reading_rate * 100]
-        }
-        
-        fig = px.bar(
-            rates_data,
-            x='Task',
-            y='Completion Rate',
-            title='Task Completion Rates (%)',
-            color='Task',
-            color_discrete_map={
-                'Shadowing': '#FF6B6B',
-                'Vocabulary': '#4ECDC4',
-                'Reading': '#45B7D1'
-            }
-        )
-        
-        fig.update_layout(
-            height=400,
-            yaxis=dict(range=[0, 100]),
-            showlegend=False
-        )
-        
-        # Add percentage labels on bars
-        for i, rate in enumerate(rates_data['Completion Rate']):
-            fig.add_annotation(
-                x=i,
-                y=rate + 2,
-                text=f"{rate:.1f}%",
-                showarrow=False,
-                font=dict(size=12, color="black")
-            )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(rates_fig, use_container_width=True)
     
     # Streak analysis
     st.subheader("Completion Streaks")
@@ -254,36 +239,101 @@ def create_toeic_charts(toeic_df: pd.DataFrame):
         recent_avg = toeic_df.tail(7)['total_completed'].mean()
         st.metric("7-Day Average", f"{recent_avg:.1f}/3", help="Average tasks completed in last 7 days")
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_toeic_figures(toeic_df: pd.DataFrame) -> tuple:
+    """Build the daily completion and completion rate figures (cached per data)"""
+    columns = [column for column, _, _ in TOEIC_TASK_TRACES]
+    
+    if len(toeic_df) > MAX_DAILY_BARS:
+        # Too many days to tell bars apart; stack weekly totals (at most 7) instead
+        weekly = _weekly_totals(toeic_df, columns)
+        x, bars = weekly['week_str'].to_numpy(), weekly
+        period = 'Week'
+    else:
+        # Build one bar trace per task straight from the column arrays,
+        # without copying the frame or reshaping it to long form; dates go to
+        # plotly as loaded and the bool flags become 0/1 bytes, not int64
+        x, bars = toeic_df['date'].to_numpy(), toeic_df
+        period = 'Date'
+    
+    completion_fig = go.Figure([
+        go.Bar(
+            name=label,
+            x=x,
+            y=bars[column].to_numpy(dtype=np.int8),
+            marker_color=color
+        )
+        for column, label, color in TOEIC_TASK_TRACES
+    ])
+    
+    completion_fig.update_layout(
+        barmode='stack',
+        title='Daily Task Completion' if period == 'Date' else 'Weekly Task Completion',
+        xaxis_title=period,
+        yaxis_title='Tasks Completed',
+        height=400,
+        xaxis_tickangle=-45
+    )
+    
+    # Calculate completion rates in one reduction over the task columns
+    rates = toeic_df[columns].mean() * 100
+    
+    rates_data = {
+        'Task': [label for _, label, _ in TOEIC_TASK_TRACES],
+        'Completion Rate': rates.tolist()
+    }
+    
+    rates_fig = px.bar(
+        rates_data,
+        x='Task',
+        y='Completion Rate',
+        title='Task Completion Rates (%)',
+        text=[f"{rate:.1f}%" for rate in rates_data['Completion Rate']],
+        color='Task',
+        color_discrete_map={
+            'Shadowing': '#FF6B6B',
+            'Vocabulary': '#4ECDC4',
+            'Reading': '#45B7D1'
+        }
+    )
+    
+    rates_fig.update_layout(
+        height=400,
+        yaxis=dict(range=[0, 100]),
+        showlegend=False
+    )
+    
+    # Percentage labels sit on the bars themselves rather than as layout annotations
+    rates_fig.update_traces(
+        textposition='outside',
+        cliponaxis=False,
+        textfont=dict(size=12, color="black")
+    )
+    
+    return completion_fig.to_dict(), rates_fig.to_dict()
+
 def calculate_current_streak(df: pd.DataFrame, column: str, target_value) -> int:
     """Calculate current streak of target value achievements"""
     if df.empty:
         return 0
     
-    streak = 0
-    for i in range(len(df) - 1, -1, -1):  # Go backwards from most recent
-        if df.iloc[i][column] == target_value:
-            streak += 1
-        else:
-            break
-    
-    return streak
+    # The streak ends at the most recent miss; argmax finds it from the end
+    misses = df[column].to_numpy()[::-1] != target_value
+    if not misses.any():
+        return len(misses)
+    return int(misses.argmax())
 
 def calculate_best_streak(df: pd.DataFrame, column: str, target_value) -> int:
     """Calculate the best (longest) streak of target value achievements"""
     if df.empty:
         return 0
     
-    current_streak = 0
-    best_streak = 0
-    
-    for _, row in df.iterrows():
-        if row[column] == target_value:
-            current_streak += 1
-            best_streak = max(best_streak, current_streak)
-        else:
-            current_streak = 0
-    
-    return best_streak
+    # Run-length encode the hits: padded edges mark where each run starts and ends
+    hits = (df[column].to_numpy() == target_value).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], hits, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max(initial=0))
 
 def create_weekly_summary_chart(immersion_df: pd.DataFrame, toeic_df: pd.DataFrame):
     """Create a weekly summary combining both immersion and TOEIC data"""
@@ -293,149 +343,110 @@ def create_weekly_summary_chart(immersion_df: pd.DataFrame, toeic_df: pd.DataFra
     
     st.subheader("Weekly Summary")
     
-    # Prepare weekly aggregation
-    if not immersion_df.empty:
-        immersion_weekly = immersion_df.copy()
-        immersion_weekly['week'] = pd.to_datetime(immersion_weekly['date']).dt.to_period('W')
-        immersion_weekly = immersion_weekly.groupby('week')['minutes'].sum().reset_index()
-        immersion_weekly['hours'] = immersion_weekly['minutes'] / 60
-        immersion_weekly['week_str'] = immersion_weekly['week'].astype(str)
-    
-    if not toeic_df.empty:
-        toeic_weekly = toeic_df.copy()
-        toeic_weekly['week'] = pd.to_datetime(toeic_weekly['date']).dt.to_period('W')
-        toeic_weekly = toeic_weekly.groupby('week')['total_completed'].sum().reset_index()
-        toeic_weekly['week_str'] = toeic_weekly['week'].astype(str)
-    
-    # Create dual-axis chart if both datasets exist
-    if not immersion_df.empty and not toeic_df.empty:
-        fig = go.Figure()
-        
-        # Add immersion hours
-        fig.add_trace(go.Bar(
-            name='Study Hours',
-            x=immersion_weekly['week_str'],
-            y=immersion_weekly['hours'],
-            yaxis='y',
-            marker_color='#2E8B57'
-        ))
-        
-        # Add TOEIC tasks
-        fig.add_trace(go.Scatter(
-            name='TOEIC Tasks',
-            x=toeic_weekly['week_str'],
-            y=toeic_weekly['total_completed'],
-            yaxis='y2',
-            mode='lines+markers',
-            marker_color='#FF6B6B',
-            line=dict(width=3)
-        ))
-        
-        fig.update_layout(
-            title='Weekly Study Hours vs TOEIC Task Completion',
-            xaxis_title='Week',
-            yaxis=dict(title='Study Hours', side='left'),
-            yaxis2=dict(title='TOEIC Tasks Completed', side='right', overlaying='y'),
-            height=400,
-            xaxis_tickangle=-45
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    # The dual-axis chart needs both datasets; bail out before any hashing or aggregation
+    if immersion_df.empty or toeic_df.empty:
+        st.info("Not enough data for weekly summary yet")
+        return
+    
+    st.plotly_chart(build_weekly_summary_figure(immersion_df, toeic_df), use_container_width=True)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_weekly_summary_figure(immersion_df: pd.DataFrame, toeic_df: pd.DataFrame) -> dict:
+    """Build the weekly study hours vs TOEIC tasks chart (cached per data)"""
+    # Prepare weekly aggregation; each side stays cached while only the other changes
+    immersion_weekly = _weekly_totals(immersion_df, ['minutes'])
+    toeic_weekly = _weekly_totals(toeic_df, ['total_completed'])
+    
+    fig = go.Figure()
+    
+    # Add immersion hours
+    fig.add_trace(go.Bar(
+        name='Study Hours',
+        x=immersion_weekly['week_str'],
+        y=immersion_weekly['minutes'] / 60,
+        yaxis='y',
+        marker_color='#2E8B57'
+    ))
+    
+    # Add TOEIC tasks
+    fig.add_trace(go.Scatter(
+        name='TOEIC Tasks',
+        x=toeic_weekly['week_str'],
+        y=toeic_weekly['total_completed'],
+        yaxis='y2',
+        mode='lines+markers',
+        marker_color='#FF6B6B',
+        line=dict(width=3)
+    ))
+    
+    fig.update_layout(
+        title='Weekly Study Hours vs TOEIC Task Completion',
+        xaxis_title='Week',
+        yaxis=dict(title='Study Hours', side='left'),
+        yaxis2=dict(title='TOEIC Tasks Completed', side='right', overlaying='y'),
+        height=400,
+        xaxis_tickangle=-45
+    )
+    
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _weekly_totals(df: pd.DataFrame, value_cols: list) -> pd.DataFrame:
+    """Sum columns per calendar week, with the week labels formatted (cached per data)"""
+    # Monday-based week numbers straight from the dates; the epoch was a Thursday
+    days = df['date'].to_numpy(dtype='datetime64[D]')
+    week_ids = (days.astype(np.int64) + 3) // 7
+    
+    # Sum each week's contiguous segment of the date-ordered values in one pass
+    order = np.argsort(week_ids, kind='stable')
+    weeks, starts = np.unique(week_ids[order], return_index=True)
+    # Reduce in float64 with blank cells counted as 0, as groupby().sum() skips them
+    values = np.nan_to_num(df[value_cols].to_numpy(dtype=np.float64))
+    sums = np.add.reduceat(values[order], starts, axis=0)
+    
+    # Labels match pandas' weekly periods, e.g. "2025-01-06/2025-01-12"
+    week_start = (weeks * 7 - 3).astype('datetime64[D]')
+    weekly = pd.DataFrame(sums, columns=value_cols)
+    # Flag and count columns (bool, integer) go back to whole numbers
+    for col in value_cols:
+        if df[col].dtype.kind in 'biu':
+            weekly[col] = weekly[col].astype(np.int64)
+    weekly['week_str'] = np.char.add(
+        np.char.add(np.datetime_as_string(week_start), '/'),
+        np.datetime_as_string(week_start + 6)
+    )
+    return weekly
 
-def create_custom_task_charts(task_data: pd.DataFrame, task_config: dict):
+def create_custom_task_charts(task_data: pd.DataFrame, task_config: dict, key_prefix: str = "custom"):
     """Create visualization charts for custom tasks"""
+    # key_prefix keeps chart keys unique when a task is charted in several tabs
     
     if task_data.empty:
         st.info("No data available for visualization")
         return
     
+    progress_fig, daily_fig, gauge_fig = build_task_figures(
+        task_data, task_config['name'], task_config['unit'], task_config['target']
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Progress over time
         st.subheader("Progress Over Time")
-        
-        # Calculate cumulative progress
-        df_cumulative = task_data.copy()
-        df_cumulative['cumulative_value'] = df_cumulative['value'].cumsum()
-        df_cumulative['progress_percentage'] = (df_cumulative['cumulative_value'] / task_config['target']) * 100
-        
-        fig = px.line(
-            df_cumulative,
-            x='date',
-            y='cumulative_value',
-            title=f'Cumulative Progress: {task_config["name"]}',
-            labels={'cumulative_value': f'Total {task_config["unit"]}', 'date': 'Date'},
-            markers=True
-        )
-        
-        # Add target line
-        fig.add_hline(
-            y=task_config['target'],
-            line_dash="dash",
-            line_color="gold",
-            annotation_text=f"Target: {task_config['target']} {task_config['unit']}"
-        )
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True, key=f"custom_progress_{task_config['id']}")
+        st.plotly_chart(progress_fig, use_container_width=True, key=f"{key_prefix}_progress_{task_config['id']}")
     
     with col2:
         # Daily values
         st.subheader("Daily Values")
-        
-        fig = px.bar(
-            task_data.tail(20),  # Last 20 entries
-            x='date',
-            y='value',
-            title=f'Daily {task_config["name"]} (Last 20 Days)',
-            labels={'value': f'{task_config["unit"]}', 'date': 'Date'}
-        )
-        
-        # Add average line
-        avg_value = task_data['value'].mean()
-        fig.add_hline(
-            y=avg_value,
-            line_dash="dash",
-            line_color="red",
-            annotation_text=f"Average: {avg_value:.1f} {task_config['unit']}"
-        )
-        
-        fig.update_layout(height=400, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True, key=f"custom_daily_{task_config['id']}")
+        st.plotly_chart(daily_fig, use_container_width=True, key=f"{key_prefix}_daily_{task_config['id']}")
     
     # Progress gauge
     if len(task_data) > 0:
         st.subheader("Goal Progress")
+        st.plotly_chart(gauge_fig, use_container_width=True, key=f"{key_prefix}_gauge_{task_config['id']}")
         
         total_value = task_data['value'].sum()
-        progress_percentage = (total_value / task_config['target']) * 100
-        
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = progress_percentage,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': f"{task_config['name']} Progress (%)"},
-            delta = {'reference': 100},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 25], 'color': "lightgray"},
-                    {'range': [25, 50], 'color': "gray"},
-                    {'range': [50, 75], 'color': "lightgreen"},
-                    {'range': [75, 100], 'color': "green"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 100
-                }
-            }
-        ))
-        
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True, key=f"custom_gauge_{task_config['id']}")
         
         # Statistics
         st.subheader("Statistics")
@@ -458,3 +469,127 @@ def create_custom_task_charts(task_data: pd.DataFrame, task_config: dict):
                 st.metric("Days to Goal", "Complete!" if remaining <= 0 else "∞")
             else:
                 st.metric("Days to Goal", f"{int(days_to_goal)} days")
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_task_figures(task_data: pd.DataFrame, name: str, unit: str, target) -> tuple:
+    """Build the cumulative, daily and gauge figures for a custom task (cached per data)"""
+    # Cumulative progress as a WebGL trace so long histories stay responsive
+    x = task_data['date'].to_numpy()
+    y = task_data['value'].cumsum().to_numpy()
+    if len(x) > MAX_TREND_POINTS:
+        keep = lttb_indices(x.astype('datetime64[D]').astype(np.int64), y, MAX_TREND_POINTS)
+        x, y = x[keep], y[keep]
+    
+    progress_fig = go.Figure(go.Scattergl(x=x, y=y, mode='lines+markers'))
+    progress_fig.update_layout(
+        title=f'Cumulative Progress: {name}',
+        xaxis_title='Date',
+        yaxis_title=f'Total {unit}'
+    )
+    
+    # Add target line
+    progress_fig.add_hline(
+        y=target,
+        line_dash="dash",
+        line_color="gold",
+        annotation_text=f"Target: {target} {unit}"
+    )
+    progress_fig.update_layout(height=400)
+    
+    daily_fig = px.bar(
+        task_data.tail(20),  # Last 20 entries
+        x='date',
+        y='value',
+        title=f'Daily {name} (Last 20 Days)',
+        labels={'value': f'{unit}', 'date': 'Date'}
+    )
+    
+    # Add average line
+    avg_value = task_data['value'].mean()
+    daily_fig.add_hline(
+        y=avg_value,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Average: {avg_value:.1f} {unit}"
+    )
+    daily_fig.update_layout(height=400, xaxis_tickangle=-45)
+    
+    progress_percentage = (task_data['value'].sum() / target) * 100
+    gauge_fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = progress_percentage,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': f"{name} Progress (%)"},
+        delta = {'reference': 100},
+        gauge = {
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 25], 'color': "lightgray"},
+                {'range': [25, 50], 'color': "gray"},
+                {'range': [50, 75], 'color': "lightgreen"},
+                {'range': [75, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 100
+            }
+        }
+    ))
+    gauge_fig.update_layout(height=400)
+    
+    return progress_fig.to_dict(), daily_fig.to_dict(), gauge_fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_study_trend_figure(df: pd.DataFrame) -> dict:
+    """Build the daily study time trend figure (cached per data)"""
+    x = df['date'].to_numpy()
+    y = df['minutes'].to_numpy()
+    if len(df) > MAX_TREND_POINTS:
+        # Long histories keep only the points that define the curve's shape
+        keep = lttb_indices(x.astype('datetime64[D]').astype(np.int64), y, MAX_TREND_POINTS)
+        x, y = x[keep], y[keep]
+    
+    fig = go.Figure(go.Scattergl(x=x, y=y, mode='lines+markers'))
+    fig.update_layout(
+        title='Daily Study Time Trend',
+        xaxis_title='Date',
+        yaxis_title='Minutes'
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_study_distribution_figure(df: pd.DataFrame) -> dict:
+    """Build the study time histogram (cached per data)"""
+    # Bin server-side so only the bar heights are sent to the browser
+    counts, edges = np.histogram(df['minutes'].to_numpy(), bins=20)
+    
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges)
+    ))
+    fig.update_layout(
+        title='Study Time Distribution',
+        xaxis_title='Minutes per Session',
+        yaxis_title='Frequency',
+        bargap=0
+    )
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_task_overview_figure(names: tuple, progress_values: tuple) -> dict:
+    """Build the custom task progress comparison bar chart (cached per input values)"""
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(names),
+            y=list(progress_values),
+            text=[f"{val:.1f}%" for val in progress_values],
+            textposition='auto',
+            marker_color=list(OVERVIEW_PALETTE[:len(names)])
+        )
+    ])
+    
+    fig.update_layout(**OVERVIEW_LAYOUT)
+    return fig.to_dict()